@@ -0,0 +1,69 @@
+"""
+Benchmark the cache of finite difference gradients in `OptimisationProblem`.
+
+Evaluates the gradients that an SQP iteration requests at each iterate
+(objective, constraints, and Lagrange function) on test problem G01,
+with and without the cache.
+
+Examples
+--------
+```
+python scripts/benchmark_cache.py --iterations 1000
+```
+"""
+
+import argparse
+from time import perf_counter as timer
+from typing import Any, Callable, Hashable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from aso.optimisation_problem import OptimisationProblem
+from aso.problem_factory import ProblemFactory
+
+
+def _uncached(problem: OptimisationProblem) -> OptimisationProblem:
+    """Disable the cache of a problem instance."""
+
+    def memoise(name: Hashable, x: NDArray, function: Callable[[NDArray], Any]) -> Any:
+        return function(np.asarray(x))
+
+    problem._memoise = memoise
+    return problem
+
+
+def _iterate(problem: OptimisationProblem, points: NDArray, lm: NDArray) -> float:
+    """Return the time to request the gradients of an SQP iteration at each point."""
+    start = timer()
+    for x in points:
+        problem.compute_grad_objective(x)
+        problem.compute_grad_constraints(x)
+        problem.compute_grad_lagrange_function(x, lm)
+    return timer() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=1000, help="number of iterates")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1, (args.iterations, 13))
+    lm = rng.uniform(0, 1, 9)
+
+    cached = ProblemFactory.g01()
+    uncached = _uncached(ProblemFactory.g01())
+    times = {"uncached": [], "cached": []}
+    # Interleave the runs, so that both see the same machine load:
+    for _ in range(args.repeat):
+        times["uncached"].append(_iterate(uncached, points, lm))
+        times["cached"].append(_iterate(cached, points, lm))
+
+    for name, t in times.items():
+        print(f"{name:>8}: {1e6 * min(t) / args.iterations:8.1f} us per iteration")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,14 +9,53 @@ python scripts/zip_project.py --config scripts/zip_project.yaml --project 1 --st
 """
 
 import argparse
+import contextlib
+import copy
 import json
+import os
 import sys
 import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from typing import Any, Sequence
 
 import yaml
 
+try:
+    # Use the LibYAML bindings if PyYAML was built with them:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+try:
+    # ISA-L and zlib-ng are drop-in replacements for zlib with
+    # SIMD-accelerated DEFLATE and CRC-32. ISA-L only supports the
+    # compression levels 0 to 3 but releases the GIL while compressing.
+    from isal import isal_zlib as zlib
+
+    _Executor = ThreadPoolExecutor
+except ImportError:
+    try:
+        from zlib_ng import zlib_ng as zlib
+    except ImportError:
+        import zlib
+
+    _Executor = ProcessPoolExecutor
+
+# Parsed configuration files keyed by (path, modification time, size):
+_CACHE: OrderedDict[tuple[str, int, int], Any] = OrderedDict()
+_CACHE_SIZE = 100
+
+# Chunk size used when reading files:
+_CHUNK_SIZE = 1 << 20
+
+# Total size of the files above which they are compressed in parallel,
+# since starting worker processes takes longer than compressing a few
+# small files, especially where processes are spawned like on Windows:
+_PARALLEL_SIZE = 16 << 20
+
 
 def deserialize(path: Path) -> Any:
     """Read a configuration file in JSON or YAML format.
@@ -35,16 +74,140 @@ def deserialize(path: Path) -> Any:
     ------
     ValueError
         If the file is not a JSON or YAML file.
+
+    Notes
+    -----
+    Parsing YAML is much slower than parsing JSON. Hence, a YAML file
+    `<name>` is converted to a hidden JSON cache file
+    `.<name>.cache.json` next to it on first use, which is read instead
+    as long as the modification time and size of the YAML file match
+    the ones stored in the cache.
+
+    Parsed files are also cached in memory, so repeated calls with an
+    unchanged file return a copy of the cached data.
     """
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return copy.deepcopy(_CACHE[key])
+
+    data = _deserialize(path)
+    _CACHE[key] = copy.deepcopy(data)
+    if len(_CACHE) > _CACHE_SIZE:
+        _CACHE.popitem(last=False)
+    return data
+
+
+def _deserialize(path: Path) -> Any:
+    """Read a configuration file in JSON or YAML format without caching."""
     extension = path.suffix.lower()
-    text = path.read_text(encoding="utf-8")
     if extension in {".json"}:
-        return json.loads(text)
+        return json.loads(path.read_text(encoding="utf-8"))
     if extension in {".yml", ".yaml"}:
-        return yaml.safe_load(text)
+        cache_path = path.with_name(f".{path.name}.cache.json")
+        stat = path.stat()
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cache["mtime_ns"] == stat.st_mtime_ns and cache["size"] == stat.st_size:
+                return cache["data"]
+        except (OSError, ValueError, TypeError, KeyError):
+            # The cache file is optional, so fall back to the YAML file if
+            # it is missing, unreadable, or corrupt.
+            pass
+        data = yaml.load(path.read_text(encoding="utf-8"), Loader=_Loader)
+        if _has_only_str_keys(data):
+            _write_json_cache(
+                cache_path, {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "data": data}
+            )
+        return data
     raise ValueError(f"Unsupported config extension: {extension}")
 
 
+def _has_only_str_keys(data: Any) -> bool:
+    """Return True if all mapping keys in `data` survive a JSON round trip."""
+    if isinstance(data, dict):
+        return all(isinstance(k, str) and _has_only_str_keys(v) for k, v in data.items())
+    if isinstance(data, list):
+        return all(_has_only_str_keys(v) for v in data)
+    return True
+
+
+def _write_json_cache(cache_path: Path, cache: dict[str, Any]) -> None:
+    """Atomically write `cache` to a JSON cache file, ignoring failures."""
+    try:
+        text = json.dumps(cache)
+    except (TypeError, ValueError):
+        # The YAML file contains types JSON cannot represent.
+        return
+
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # The cache is optional, e.g. in read-only directories.
+        tmp_path.unlink(missing_ok=True)
+
+
+def _deflate(path: Path, level: int) -> tuple[int, int, bytes]:
+    """Compress a file with raw DEFLATE as stored in ZIP archives.
+
+    Parameters
+    ----------
+    path : Path
+        Path to the file.
+    level : int
+        zlib compression level, limited to the highest level supported
+        by the DEFLATE implementation.
+
+    Returns
+    -------
+    tuple of int, int, bytes
+        CRC-32 and size of the uncompressed file and the compressed data.
+    """
+    compressor = zlib.compressobj(min(level, zlib.Z_BEST_COMPRESSION), zlib.DEFLATED, -15)
+    crc = 0
+    size = 0
+    chunks = []
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            chunks.append(compressor.compress(chunk))
+    chunks.append(compressor.flush())
+    return crc, size, b"".join(chunks)
+
+
+def _write_deflated(
+    zip_file: zipfile.ZipFile,
+    path: Path,
+    arcname: str,
+    crc: int,
+    size: int,
+    data: bytes,
+) -> None:
+    """Append a file compressed by `_deflate` to a ZIP archive.
+
+    `zipfile` has no public API for precompressed data, so this mirrors
+    what `ZipFile.writestr` does after compressing.
+    """
+    zinfo = zipfile.ZipInfo.from_file(path, arcname)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(data)
+
+    zip_file._writecheck(zinfo)
+    zip_file._didModify = True
+    zinfo.header_offset = zip_file.fp.tell()
+    zip_file.fp.write(zinfo.FileHeader())
+    zip_file.fp.write(data)
+    zip_file.filelist.append(zinfo)
+    zip_file.NameToInfo[zinfo.filename] = zinfo
+    zip_file.start_dir = zip_file.fp.tell()
+
+
 def main(argv: Sequence[str] | None = None) -> None:
     parser = argparse.ArgumentParser(
         description="Redact Python function bodies (keep docstrings) and zip outputs.",
@@ -64,6 +227,14 @@ def main(argv: Sequence[str] | None = None) -> None:
         required=True,
         help="Student ID.",
     )
+    parser.add_argument(
+        "--compresslevel",
+        type=int,
+        default=1,
+        choices=range(0, 10),
+        metavar="{0,...,9}",
+        help="zlib compression level (default: 1, fastest).",
+    )
     args = parser.parse_args(argv)
 
     config_path = Path(args.config)
@@ -78,28 +249,71 @@ def main(argv: Sequence[str] | None = None) -> None:
     zip = Path(f"aso_project_{args.project}_student_{args.student}.zip")
     zip.parent.mkdir(parents=True, exist_ok=True)
 
-    with zipfile.ZipFile(zip, "w", compression=zipfile.ZIP_DEFLATED) as zip_deflated:
-        for file_index, file in enumerate(files, 1):
-            if isinstance(file, str):
-                path_str = file
-            else:
-                path_str = file.get("path")
-
-            if not path_str:
-                print(f"No path for file {file_index}.", file=sys.stderr)
-                continue
-
-            path = Path(path_str)
-            if not path.exists() or path.is_dir():
-                print(f"{path_str} is not a file.", file=sys.stderr)
-                continue
-
-            arcname = path.as_posix()
-            with path.open("rb") as f:
-                zip_deflated.writestr(
-                    zinfo_or_arcname=arcname,
-                    data=f.read(),
-                )
+    path_strs = []
+    for file_index, file in enumerate(files, 1):
+        if isinstance(file, str):
+            path_str = file
+        else:
+            path_str = file.get("path")
+
+        if not path_str:
+            print(f"No path for file {file_index}.", file=sys.stderr)
+            continue
+
+        path_strs.append(path_str)
+
+    # Scan each parent directory once instead of calling stat per file,
+    # since directory entries cache the file type:
+    entries: dict[Path, os.DirEntry] = {}
+    for parent in {Path(path_str).parent for path_str in path_strs}:
+        try:
+            with os.scandir(parent) as iterator:
+                entries.update({parent / entry.name: entry for entry in iterator})
+        except OSError:
+            pass
+
+    paths = []
+    total_size = 0
+    for path_str in path_strs:
+        path = Path(path_str)
+        entry = entries.get(path)
+        if entry is not None:
+            is_file = entry.is_file()
+        else:
+            # The lookup is case-sensitive, so ask the filesystem, which
+            # may not be, e.g., on macOS and Windows:
+            is_file = path.is_file()
+        if not is_file:
+            print(f"{path_str} is not a file.", file=sys.stderr)
+            continue
+
+        paths.append(path)
+        total_size += (entry or path).stat().st_size
+
+    with contextlib.ExitStack() as stack:
+        zip_deflated = stack.enter_context(
+            zipfile.ZipFile(
+                zip,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                compresslevel=args.compresslevel,
+            )
+        )
+
+        workers = min(len(paths), os.cpu_count() or 1)
+        if workers == 1 or total_size < _PARALLEL_SIZE:
+            # Stream the files into the archive chunk by chunk:
+            for path in paths:
+                zip_deflated.write(path, arcname=path.as_posix())
+        else:
+            # Compress the files in parallel but write each one as soon as
+            # it and all files before it are done, so that only finished
+            # members waiting for their turn are held in memory:
+            executor = stack.enter_context(_Executor(max_workers=workers))
+            results = executor.map(_deflate, paths, repeat(args.compresslevel))
+            for path_index, (crc, size, data) in enumerate(results):
+                path = paths[path_index]
+                _write_deflated(zip_deflated, path, path.as_posix(), crc, size, data)
 
     print(f"Successfully zipped project files: {zip}")
 
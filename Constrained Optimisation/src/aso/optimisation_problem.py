@@ -6,7 +6,11 @@ Defines the `OptimisationProblem` class.
 """
 
 import logging
-from typing import Callable
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, cached_property
+from typing import Any, Callable, Hashable, Literal
 
 import numpy as np
 from numpy.typing import NDArray
@@ -14,6 +18,36 @@ from numpy.typing import NDArray
 logger = logging.getLogger(__name__)
 
 
+def _fd_grad(objective: Callable[[NDArray], float], x: NDArray, dx: float) -> NDArray:
+    """Return the central finite difference gradient of a jitted objective."""
+    grad = np.empty(x.size)
+    x_local = x.copy()
+    for i in range(x.size):
+        x_local[i] = x[i] - dx
+        f_backward = objective(x_local)
+        x_local[i] = x[i] + dx
+        f_forward = objective(x_local)
+        grad[i] = (f_forward - f_backward) / (2 * dx)
+        x_local[i] = x[i]
+    return grad
+
+
+def _objective_signature() -> Any:
+    """Return the Numba signature of compiled objective functions."""
+    from numba import float64
+
+    return float64(float64[::1])
+
+
+@cache
+def _compile_fd_grad() -> Callable[[Callable[[NDArray], float], NDArray, float], NDArray]:
+    """Compile `_fd_grad` once for all objectives with the fixed signature."""
+    from numba import float64, njit, types
+
+    signature = float64[::1](types.FunctionType(_objective_signature()), float64[::1], float64)
+    return njit(signature, cache=True)(_fd_grad)
+
+
 class OptimisationProblem:
     """
     Attributes
@@ -26,8 +60,23 @@ class OptimisationProblem:
         Known global minima as references for test problems.
     grad_constraints_evaluations : int
         Current number of evaluations of the gradients of the constraints.
+
+    Notes
+    -----
+    Finite difference gradients of the objective and the constraints
+    are cached for the last few design variables, since optimisers
+    typically request them several times at the same point and each
+    one costs 2n evaluations. Function values and analytic gradients
+    are not cached, since they are cheaper than the cache lookup.
+
+    If `workers` is given, the worker threads are shut down by `close`,
+    when leaving a ``with`` block, or when the problem is garbage
+    collected.
     """
 
+    # Number of design variable vectors with cached evaluations:
+    _CACHE_SIZE = 4
+
     def __init__(
         self,
         objective: Callable[[NDArray], float],
@@ -39,6 +88,12 @@ class OptimisationProblem:
         e_constraints: list[Callable[[NDArray], float]] | None = None,
         grad_e_constraints: list[Callable[[NDArray], NDArray]] | None = None,
         minima: list[NDArray] | None = None,
+        objective_batched: Callable[[NDArray], NDArray] | None = None,
+        constraints_batched: Callable[[NDArray], NDArray] | None = None,
+        workers: int | None = None,
+        constraints_vec: Callable[[NDArray], NDArray] | None = None,
+        grad_constraints_jac: Callable[[NDArray], NDArray] | None = None,
+        jit: bool = False,
     ) -> None:
         """Create a new OptimisationProblem instance.
 
@@ -62,6 +117,38 @@ class OptimisationProblem:
             Gradients of equality constraints.
         minima : list of numpy.ndarray, optional
             Known global minima as references for test problems.
+        objective_batched : callable, optional
+            Vectorised objective function that maps an array of shape
+            (k, n) to the k objective values of its rows. Used for
+            finite differences if no analytic gradient is provided.
+        constraints_batched : callable, optional
+            Vectorised constraint functions that map an array of shape
+            (k, n) to an array of shape (k, m + me) holding the
+            inequality and then the equality constraint values of its
+            rows. Used for finite differences if no analytic gradients
+            are provided.
+        workers : int, optional
+            Number of threads evaluating finite differences in parallel
+            (default: serial evaluation). Only worthwhile for expensive,
+            thread-safe functions that release the GIL.
+        constraints_vec : callable, optional
+            Function returning the values of all inequality and then
+            all equality constraints as one array. Used instead of the
+            individual constraint functions, which are still required
+            to define the constraints, if all constraints are evaluated.
+        grad_constraints_jac : callable, optional
+            Function returning the Jacobian of all inequality and then
+            all equality constraints as one array of shape (m + me, n).
+        jit : bool, optional
+            Whether to compile the objective function with Numba and
+            compute finite differences in native code (default: False).
+            The objective must be supported by `numba.njit` and map a
+            contiguous float64 array to a float.
+
+        Raises
+        ------
+        ImportError
+            If `jit` is True but Numba is not installed.
         """
 
         # "Private" attributes:
@@ -71,6 +158,33 @@ class OptimisationProblem:
         self._grad_i_constraints = grad_i_constraints
         self._e_constraints = e_constraints
         self._grad_e_constraints = grad_e_constraints
+        # All inequality and then all equality constraints as tuples, so
+        # they are not concatenated on every evaluation:
+        self._constraints = tuple((i_constraints or []) + (e_constraints or []))
+        self._grad_constraints = tuple((grad_i_constraints or []) + (grad_e_constraints or []))
+        self._objective_batched = objective_batched
+        self._constraints_batched = constraints_batched
+        self._workers = workers
+        self._constraints_vec = constraints_vec
+        self._grad_constraints_jac = grad_constraints_jac
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_finalizer: weakref.finalize | None = None
+        self._objective_jit: Callable[[NDArray], float] | None = None
+        if jit:
+            # Numba is imported lazily, since it takes long to import:
+            try:
+                from numba import njit
+                from numba.extending import is_jitted
+            except ImportError:
+                raise ImportError("Numba is required to compile the objective function.") from None
+            if is_jitted(objective):
+                self._objective_jit = objective
+            else:
+                self._objective_jit = njit(_objective_signature())(objective)
+        self._scratch: NDArray | None = None
+        self._cache: OrderedDict[tuple[str, tuple[int, ...], bytes], dict[Hashable, Any]] = (
+            OrderedDict()
+        )
 
         # "Public" attributes:
         self.lb = lower_bounds
@@ -78,21 +192,35 @@ class OptimisationProblem:
         self.minima = minima
         self.grad_constraints_evaluations: int = 0
 
-    @property
+    @cached_property
     def m(self) -> int:
         """Return the number of inequality constraints."""
         return len(self._i_constraints or [])
 
-    @property
+    @cached_property
     def me(self) -> int:
         """Return the number of equality constraints."""
         return len(self._e_constraints or [])
 
-    @property
+    @cached_property
     def constrained(self) -> bool:
         """Return True if the problem is constrained."""
         return self.m + self.me > 0
 
+    def __enter__(self) -> "OptimisationProblem":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker threads used for finite differences."""
+        if self._executor is not None:
+            self._executor_finalizer.detach()
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_finalizer = None
+
     def compute_objective(self, x: NDArray) -> float:
         """Return the value of the objective function.
 
@@ -108,7 +236,12 @@ class OptimisationProblem:
         """
         return self._objective(x)
 
-    def compute_grad_objective(self, x: NDArray, dx: float = 1e-6) -> NDArray:
+    def compute_grad_objective(
+        self,
+        x: NDArray,
+        dx: float = 1e-6,
+        method: Literal["CENTRAL", "COMPLEX_STEP"] = "CENTRAL",
+    ) -> NDArray:
         """Return the gradient of the objective function.
 
         Parameters
@@ -117,29 +250,102 @@ class OptimisationProblem:
             Design variables.
         dx : float, optional
             Finite difference step size (default: 1e-6).
+        method : str, default: "CENTRAL"
+            Numerical differentiation method if no analytic gradient is
+            provided.
 
         Returns
         -------
         numpy.ndarray
             Gradient of the objective function.
 
+        Raises
+        ------
+        ValueError
+            If `method` is unknown.
+
         Notes
         -----
         If an analytic gradient is provided, it is used. Otherwise,
         central finite differences are used to approximate the gradient.
+        If a vectorised objective is provided, all 2n perturbed design
+        variables are evaluated in a single call. If the objective is
+        compiled with Numba, the finite differences run in native code.
+
+        The complex-step method [1]_ needs only n evaluations and does
+        not suffer from subtractive cancellation, so `dx` can be as
+        small as 1e-30. It requires an objective function that is
+        analytic and accepts complex design variables, i.e., that does
+        not use `abs`, `numpy.linalg.norm`, or comparisons.
+
+        References
+        ----------
+        .. [1] J. R. R. A. Martins, P. Sturdza, and J. J. Alonso, "The complex-step derivative approximation," ACM Transactions on Mathematical Software, vol. 29, no. 3, pp. 245-262, 2003. doi: https://doi.org/10.1145/838250.838251.
         """
+        if method not in ("CENTRAL", "COMPLEX_STEP"):
+            raise ValueError(f"Unknown differentiation method: {method}")
+
+        if self._grad_objective is not None:
+            return self._grad_objective(x)
+        return self._memoise(
+            ("grad_objective", dx, method),
+            x,
+            lambda x: self._compute_grad_objective(x, dx, method),
+        )
+
+    def _compute_grad_objective(
+        self,
+        x: NDArray,
+        dx: float,
+        method: Literal["CENTRAL", "COMPLEX_STEP"] = "CENTRAL",
+    ) -> NDArray:
+        """Return the gradient of the objective function without caching."""
         if self._grad_objective is not None:
             return self._grad_objective(x)
 
+        if method == "COMPLEX_STEP":
+            return self._complex_step_grad_objective(x, dx)
+
+        if self._objective_batched is not None:
+            perturbation = dx * np.eye(x.size)
+            f = self._objective_batched(np.vstack((x - perturbation, x + perturbation)))
+            return (f[x.size :] - f[: x.size]) / (2 * dx)
+
+        if self._objective_jit is not None:
+            return _compile_fd_grad()(
+                self._objective_jit, np.ascontiguousarray(x, dtype=float), dx
+            )
+
+        if self._workers is not None and self._workers > 1:
+            f_backward, f_forward = self._evaluate_in_parallel(self._objective, x, dx)
+            return (f_forward - f_backward) / (2 * dx)
+
         grad = np.empty(x.size)
-        x_local = np.copy(x)
+        x_local = self._copy_to_scratch(x)
         for i in range(x.size):
-            x_local[i] -= dx
-            f_backward = self.compute_objective(x_local)
-            x_local[i] += 2 * dx
-            f_forward = self.compute_objective(x_local)
+            # Single assignments instead of augmented ones, which index
+            # the array twice:
+            x_i = x.item(i)
+            x_local[i] = x_i - dx
+            f_backward = self._objective(x_local)
+            x_local[i] = x_i + dx
+            f_forward = self._objective(x_local)
             grad[i] = (f_forward - f_backward) / (2 * dx)
-            x_local[i] = x[i]
+            x_local[i] = x_i
+        return grad
+
+    def _complex_step_grad_objective(self, x: NDArray, dx: float) -> NDArray:
+        """Return the complex-step approximation of the objective's gradient."""
+        if self._objective_batched is not None:
+            f = self._objective_batched(x + 1j * dx * np.eye(x.size))
+            return np.imag(f) / dx
+
+        grad = np.empty(x.size)
+        x_complex = x.astype(np.complex128)
+        for i in range(x.size):
+            x_complex[i] = complex(x.item(i), dx)
+            grad[i] = np.imag(self._objective(x_complex)) / dx
+            x_complex[i] = x.item(i)
         return grad
 
     def compute_constraints(self, x: NDArray, selection: list[int] | None = None) -> NDArray:
@@ -165,12 +371,24 @@ class OptimisationProblem:
         if self.m + self.me == 0:
             raise Exception("Unconstrained problem.")
 
-        constraints = (self._i_constraints or []) + (self._e_constraints or [])
+        return self._compute_constraints(x, selection)
 
+    def _compute_constraints(self, x: NDArray, selection: list[int] | None = None) -> NDArray:
+        """Return the values of the constraints of a constrained problem."""
+        if self._constraints_vec is not None and selection is None:
+            return self._constraints_vec(x)
+
+        constraints = self._constraints
         if selection is None:
-            return np.array([c(x) for c in constraints])
+            g = np.empty(len(constraints))
+            for k, c in enumerate(constraints):
+                g[k] = c(x)
+            return g
 
-        return np.array([c(x) for c in [constraints[i] for i in selection]])
+        g = np.empty(len(selection))
+        for k, i in enumerate(selection):
+            g[k] = constraints[i](x)
+        return g
 
     def compute_grad_constraints(
         self,
@@ -203,36 +421,163 @@ class OptimisationProblem:
 
         Notes
         -----
-        If analytic gradients are provided, they are used. Otherwise,
-        central finite differences are used to approximate the
-        gradients.
+        If an analytic Jacobian or analytic gradients are provided, they
+        are used. Otherwise, central finite differences are used to
+        approximate the gradients. If vectorised constraints are
+        provided, all 2n perturbed design variables are evaluated in a
+        single call.
         """
         if self.m + self.me == 0:
             raise Exception("Unconstrained problem.")
 
+        if (
+            selection is not None
+            or self._grad_constraints_jac is not None
+            or self._grad_i_constraints is not None
+            or self._grad_e_constraints is not None
+        ):
+            return self._compute_grad_constraints(x, dx, selection)
+        return self._memoise(
+            ("grad_constraints", dx), x, lambda x: self._compute_grad_constraints(x, dx)
+        )
+
+    def _compute_grad_constraints(
+        self,
+        x: NDArray,
+        dx: float,
+        selection: list[int] | None = None,
+    ) -> NDArray:
+        """Return the gradients of the constraints without caching."""
+        if self._grad_constraints_jac is not None and selection is None:
+            return self._grad_constraints_jac(x)
+
         if self._grad_i_constraints is not None or self._grad_e_constraints is not None:
-            grad_constraints = (self._grad_i_constraints or []) + (self._grad_e_constraints or [])
+            grad_constraints = self._grad_constraints
             if selection is None:
                 return np.array([grad(x) for grad in grad_constraints])
             else:
                 return np.array([grad_constraints[i](x) for i in selection])
 
+        if self._grad_constraints_jac is not None:
+            return self._grad_constraints_jac(x)[selection]
+
+        if self._constraints_batched is not None:
+            perturbation = dx * np.eye(x.size)
+            g = self._constraints_batched(np.vstack((x - perturbation, x + perturbation)))
+            if selection is not None:
+                g = g[:, selection]
+            self.grad_constraints_evaluations += 1
+            return ((g[x.size :] - g[: x.size]) / (2 * dx)).T
+
+        if self._workers is not None and self._workers > 1:
+            g_backward, g_forward = self._evaluate_in_parallel(
+                lambda x_local: self._compute_constraints(x_local, selection), x, dx
+            )
+            self.grad_constraints_evaluations += 1
+            return ((g_forward - g_backward) / (2 * dx)).T
+
         if selection is None:
             grad = np.empty((self.m + self.me, x.size))
         else:
             grad = np.empty((len(selection), x.size))
 
-        x_local = np.copy(x)
+        x_local = self._copy_to_scratch(x)
         for i in range(x.size):
-            x_local[i] -= dx
-            g_backward = self.compute_constraints(x_local, selection)
-            x_local[i] += 2 * dx
-            g_forward = self.compute_constraints(x_local, selection)
+            x_i = x.item(i)
+            x_local[i] = x_i - dx
+            g_backward = self._compute_constraints(x_local, selection)
+            x_local[i] = x_i + dx
+            g_forward = self._compute_constraints(x_local, selection)
             grad[:, i] = (g_forward - g_backward) / (2 * dx)
-            x_local[i] -= dx
+            x_local[i] = x_i
         self.grad_constraints_evaluations += 1
         return grad
 
+    def _copy_to_scratch(self, x: NDArray) -> NDArray:
+        """Copy the design variables into a reusable buffer.
+
+        Avoids allocating a new array for the perturbed design variables
+        in every serial finite difference evaluation.
+        """
+        # Always floating point, so that integer design variables are
+        # not truncated when perturbed:
+        if self._scratch is None or self._scratch.shape != x.shape:
+            self._scratch = np.empty(x.shape)
+        np.copyto(self._scratch, x)
+        return self._scratch
+
+    def _memoise(self, name: Hashable, x: NDArray, function: Callable[[NDArray], Any]) -> Any:
+        """Return a cached function value or evaluate and cache it.
+
+        Parameters
+        ----------
+        name : hashable
+            Name of the cached quantity, including relevant parameters.
+        x : array_like
+            Design variables. The dtype and shape are part of the key.
+        function : callable
+            Function computing the quantity if it is not cached.
+
+        Returns
+        -------
+        Any
+            Value of the quantity. Arrays are copied, so callers may
+            modify them without corrupting the cache.
+        """
+        x = np.asarray(x)
+        key = (x.dtype.str, x.shape, x.tobytes())
+        values = self._cache.get(key)
+        if values is None:
+            values = self._cache[key] = {}
+            if len(self._cache) > self._CACHE_SIZE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+
+        if name not in values:
+            value = function(x)
+            values[name] = np.copy(value) if isinstance(value, np.ndarray) else value
+        value = values[name]
+        return np.copy(value) if isinstance(value, np.ndarray) else value
+
+    def _evaluate_in_parallel(
+        self,
+        function: Callable[[NDArray], float | NDArray],
+        x: NDArray,
+        dx: float,
+    ) -> tuple[NDArray, NDArray]:
+        """Evaluate a function at all central finite difference points.
+
+        Parameters
+        ----------
+        function : callable
+            Function to evaluate.
+        x : numpy.ndarray
+            Design variables.
+        dx : float
+            Finite difference step size.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            Function values at `x - dx * e_i` and `x + dx * e_i`, where
+            the i-th row belongs to the i-th design variable.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+            # Shut the threads down if the problem is never closed:
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown, wait=False)
+
+        def evaluate(i: int, step: float) -> float | NDArray:
+            x_local = np.array(x, dtype=float)
+            x_local[i] += step
+            return function(x_local)
+
+        indices = list(range(x.size))
+        backward = self._executor.map(evaluate, indices, [-dx] * x.size)
+        forward = self._executor.map(evaluate, indices, [dx] * x.size)
+        return np.array(list(backward)), np.array(list(forward))
+
     def compute_lagrange_function(self, x: NDArray, lm: NDArray) -> float:
         """Return the value of the Lagrange function.
 
@@ -248,11 +593,9 @@ class OptimisationProblem:
         float
             Value of the Lagrange function.
         """
-        f = self._objective(x)
+        f = self.compute_objective(x)
         if self.m + self.me > 0:
-            g = self.compute_constraints(x)
-            for i in range(self.m + self.me):
-                f += lm[i] * g[i]
+            f += float(np.dot(lm, self.compute_constraints(x)))
         return f
 
     def compute_grad_lagrange_function(self, x: NDArray, lm: NDArray) -> NDArray:
@@ -272,7 +615,5 @@ class OptimisationProblem:
         """
         grad = self.compute_grad_objective(x)
         if self.m + self.me > 0:
-            grad_g = self.compute_grad_constraints(x)
-            for i in range(self.m + self.me):
-                grad += lm[i] * grad_g[i]
+            grad = grad + lm @ self.compute_grad_constraints(x)
         return grad
@@ -26,7 +26,7 @@ class OptimiserState(Enum):
     UNDEFINED = auto()
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OptimisationResult:
     """(Intermediate) result of an optimisation problem.
 
@@ -34,6 +34,17 @@ class Optimiser:
         Number of design variables.
     lm : numpy.ndarray
         Current Lagrange multipliers.
+    history_x : numpy.ndarray
+        Design variables of each recorded iteration, one row per
+        iteration. Rows of iterations that were not recorded are NaN.
+    history_objective : numpy.ndarray
+        Objective function value of each recorded iteration.
+    history_step : numpy.ndarray
+        Step taken in each recorded iteration, one row per iteration.
+    history_length : int
+        Number of rows of the history arrays that are in use. While an
+        algorithm is running, the arrays may have spare rows; after
+        `optimise` returns, they are trimmed to this length.
     """
 
     def __init__(
@@ -74,6 +85,8 @@ class Optimiser:
         else:
             self.lm = lm
 
+        self._reset_history()
+
     def optimise(
         self,
         algorithm: Literal[
@@ -111,6 +124,8 @@ class Optimiser:
             optimisation.
         """
 
+        self._reset_history()
+
         start = timer()
 
         if self.problem.constrained:
@@ -147,6 +162,7 @@ class Optimiser:
                     )
 
         end = timer()
+        self._trim_history()
         elapsed_ms = round((end - start) * 1000, 3)
 
         if iteration == -1:
@@ -162,6 +178,92 @@ class Optimiser:
 
         return iteration
 
+    def _reset_history(self) -> None:
+        """Clear the history arrays without allocating any rows."""
+        self.history_x = np.empty((0, self.n))
+        self.history_objective = np.empty(0)
+        self.history_step = np.empty((0, self.n))
+        self.history_length = 0
+
+    def _resize_history(self, size: int) -> None:
+        """Resize the history arrays to `size` rows, filling new rows with NaN."""
+        rows = min(size, self.history_length)
+        for name in ("history_x", "history_objective", "history_step"):
+            old = getattr(self, name)
+            new = np.full((size,) + old.shape[1:], np.nan)
+            new[:rows] = old[:rows]
+            setattr(self, name, new)
+
+    def _trim_history(self) -> None:
+        """Drop the spare rows of the history arrays."""
+        if self.history_x.shape[0] != self.history_length:
+            self._resize_history(self.history_length)
+
+    def record_iteration(
+        self,
+        iteration: int,
+        objective: float,
+        step: NDArray | None = None,
+    ) -> None:
+        """Store the current design variables in the history arrays.
+
+        Parameters
+        ----------
+        iteration : int
+            Iteration number, which is also the row index.
+        objective : float
+            Current objective function value.
+        step : numpy.ndarray, optional
+            Step taken in this iteration (stored as NaN if omitted).
+
+        Notes
+        -----
+        The history is stored in arrays instead of one
+        `OptimisationResult` per iteration, which saves memory and
+        allocations for long runs. The arrays are allocated on the first
+        call and grow geometrically, so runs that do not record their
+        iterations allocate nothing.
+        """
+        capacity = self.history_x.shape[0]
+        if iteration >= capacity:
+            self._resize_history(max(iteration + 1, 2 * capacity, 16))
+
+        self.history_x[iteration] = self.x
+        self.history_objective[iteration] = objective
+        if step is None:
+            self.history_step[iteration] = np.nan
+        else:
+            self.history_step[iteration] = step
+        self.history_length = max(self.history_length, iteration + 1)
+
+    def get_result(self, iteration: int) -> OptimisationResult:
+        """Return a recorded iteration as an `OptimisationResult`.
+
+        Parameters
+        ----------
+        iteration : int
+            Iteration number.
+
+        Returns
+        -------
+        OptimisationResult
+            Result with copies of the recorded arrays, so modifying it
+            does not change the history.
+
+        Raises
+        ------
+        IndexError
+            If the iteration has not been recorded.
+        """
+        if not 0 <= iteration < self.history_length:
+            raise IndexError(f"Iteration {iteration} has not been recorded.")
+        return OptimisationResult(
+            iteration=iteration,
+            x=self.history_x[iteration].copy(),
+            objective=float(self.history_objective[iteration]),
+            step=self.history_step[iteration].copy(),
+        )
+
     def steepest_descent(
         self,
         iteration_limit: int = 1000,
@@ -10,15 +10,39 @@ from aso.optimisation_problem import OptimisationProblem
 logger = logging.getLogger(__name__)
 
 
+def _njit(function):
+    """Compile a test function with Numba if `ProblemFactory.jit` is set.
+
+    The compiled functions are cached on disk, so they are only compiled
+    once across test sessions.
+    """
+    if not ProblemFactory.jit:
+        return function
+    # Numba is imported lazily, since it takes long to import:
+    import numba
+
+    return numba.njit(cache=True, fastmath=True)(function)
+
+
 class ProblemFactory:
     """
     Wrapper class for benchmark problems and random problem generators.
 
+    Attributes
+    ----------
+    jit : bool
+        Whether to compile the objective functions of the test problems
+        created afterwards with Numba (default: False). Only worthwhile
+        for long runs, since importing Numba and loading the compiled
+        functions takes several tenths of a second. Requires Numba.
+
     References
     ----------
     .. [1] https://en.wikipedia.org/wiki/Test_functions_for_optimization
     """
 
+    jit: bool = False
+
     @staticmethod
     def random_quadratic_problem(
         n: int,
@@ -179,6 +203,7 @@ class ProblemFactory:
                 "The constrained Rosenbrock problem is only implemented for n=2, a=1, b=100."
             )
 
+        @_njit
         def objective(vars: NDArray) -> float:
             """Return the current value of the objective function.
 
@@ -198,6 +223,7 @@ class ProblemFactory:
             y = vars[1]
             return (a - x) ** 2 + b * (y - x**2) ** 2
 
+        @_njit
         def grad_objective(vars: NDArray) -> NDArray:
             """Return the current gradient of the objective function.
 
@@ -308,6 +334,7 @@ class ProblemFactory:
         if constrained and n != 2:
             raise ValueError("The constrained sphere problem is only implemented for n=2.")
 
+        @_njit
         def objective(x: NDArray) -> float:
             return numpy.sum(x**2)
 
@@ -369,6 +396,7 @@ class ProblemFactory:
     def booth(constrained: bool = False) -> OptimisationProblem:
         """Return the Booth test problem."""
 
+        @_njit
         def objective(vars: NDArray) -> float:
             x = vars[0]
             y = vars[1]
@@ -424,6 +452,7 @@ class ProblemFactory:
     def matyas(constrained: bool = False) -> OptimisationProblem:
         """Return the Matyas test problem."""
 
+        @_njit
         def objective(vars: NDArray) -> float:
             x = vars[0]
             y = vars[1]
@@ -485,6 +514,7 @@ class ProblemFactory:
     def himmelblau(constrained: bool = False) -> OptimisationProblem:
         """Return the Himmelblau test problem."""
 
+        @_njit
         def objective(vars: NDArray) -> float:
             x = vars[0]
             y = vars[1]
@@ -537,6 +567,7 @@ class ProblemFactory:
     def easom(constrained: bool = False) -> OptimisationProblem:
         """Return the Easom test problem."""
 
+        @_njit
         def objective(vars: NDArray) -> float:
             x = vars[0]
             y = vars[1]
@@ -644,6 +675,7 @@ class ProblemFactory:
     def mccormick(constrained: bool = False) -> OptimisationProblem:
         """Return the McCormick test problem."""
 
+        @_njit
         def objective(vars: NDArray) -> float:
             x = vars[0]
             y = vars[1]
@@ -1081,6 +1113,7 @@ class ProblemFactory:
         - `numpy.array([1.414, 1.414, 0.0, 1.0, 0.586])`
         """
 
+        @_njit
         def objective(x: NDArray) -> float:
             return (x[0] - 2) ** 2 + (x[1] - 1) ** 2 + x[2] ** 2 + x[3] ** 2 + x[4] ** 2
 
@@ -0,0 +1,182 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from aso import OptimisationProblem
+from aso.optimisation_problem import _compile_fd_grad
+
+
+def objective(x):
+    return (1 - x[0]) ** 2 + 100 * (x[1] - x[0] ** 2) ** 2
+
+
+def g1(x):
+    return x[0] ** 2 + x[1] ** 2 - 1
+
+
+def h1(x):
+    return x[0] - 2 * x[1]
+
+
+def test_batched_finite_differences():
+    x = np.array([0.3, -0.7])
+    problem = OptimisationProblem(objective, i_constraints=[g1], e_constraints=[h1])
+    batched = OptimisationProblem(
+        objective,
+        i_constraints=[g1],
+        e_constraints=[h1],
+        objective_batched=lambda X: np.array([objective(row) for row in X]),
+        constraints_batched=lambda X: np.array([[g1(row), h1(row)] for row in X]),
+    )
+    assert batched.compute_grad_objective(x) == pytest.approx(problem.compute_grad_objective(x))
+    assert batched.compute_grad_constraints(x) == pytest.approx(
+        problem.compute_grad_constraints(x)
+    )
+    assert batched.compute_grad_constraints(x, selection=[1]) == pytest.approx(
+        problem.compute_grad_constraints(x, selection=[1])
+    )
+
+
+def test_parallel_finite_differences():
+    x = np.array([0.3, -0.7])
+    problem = OptimisationProblem(objective, i_constraints=[g1], e_constraints=[h1])
+    parallel = OptimisationProblem(objective, i_constraints=[g1], e_constraints=[h1], workers=2)
+    assert parallel.compute_grad_objective(x) == pytest.approx(problem.compute_grad_objective(x))
+    assert parallel.compute_grad_constraints(x) == pytest.approx(
+        problem.compute_grad_constraints(x)
+    )
+    assert parallel.compute_grad_constraints(x, selection=[0]) == pytest.approx(
+        problem.compute_grad_constraints(x, selection=[0])
+    )
+
+
+def test_fused_constraints():
+    x = np.array([0.3, -0.7])
+    jacobian = np.array([[2 * x[0], 2 * x[1]], [1.0, -2.0]])
+    problem = OptimisationProblem(objective, i_constraints=[g1], e_constraints=[h1])
+    fused = OptimisationProblem(
+        objective,
+        i_constraints=[g1],
+        e_constraints=[h1],
+        constraints_vec=lambda x: np.array([g1(x), h1(x)]),
+        grad_constraints_jac=lambda x: np.array([[2 * x[0], 2 * x[1]], [1.0, -2.0]]),
+    )
+    assert fused.compute_constraints(x) == pytest.approx(problem.compute_constraints(x))
+    assert fused.compute_grad_constraints(x) == pytest.approx(jacobian)
+    assert fused.compute_grad_constraints(x, selection=[1]) == pytest.approx(jacobian[[1]])
+
+
+def test_lagrange_function():
+    x = np.array([0.3, -0.7])
+    lm = np.array([0.5, -2.0])
+    problem = OptimisationProblem(objective, i_constraints=[g1], e_constraints=[h1])
+    assert problem.compute_lagrange_function(x, lm) == pytest.approx(
+        objective(x) + lm[0] * g1(x) + lm[1] * h1(x)
+    )
+    grad_g = problem.compute_grad_constraints(x)
+    assert problem.compute_grad_lagrange_function(x, lm) == pytest.approx(
+        problem.compute_grad_objective(x) + lm[0] * grad_g[0] + lm[1] * grad_g[1]
+    )
+
+
+def test_cached_evaluations():
+    calls = []
+
+    def counted_objective(x):
+        calls.append(np.copy(x))
+        return objective(x)
+
+    x = np.array([0.3, -0.7])
+    problem = OptimisationProblem(counted_objective, i_constraints=[g1])
+    grad = problem.compute_grad_objective(x)
+    grad[:] = 0
+    assert problem.compute_grad_objective(x) == pytest.approx(
+        OptimisationProblem(objective).compute_grad_objective(x)
+    )
+    assert len(calls) == 2 * x.size
+    # Function values are not cached:
+    problem.compute_objective(x)
+    problem.compute_objective(x)
+    assert len(calls) == 2 + 2 * x.size
+    x[0] += 0.1
+    problem.compute_grad_objective(x)
+    assert len(calls) == 2 + 4 * x.size
+
+
+def test_cached_evaluations_of_lists():
+    x = [0.3, -0.7]
+    problem = OptimisationProblem(objective, i_constraints=[g1])
+    grad = OptimisationProblem(objective).compute_grad_objective(np.array(x))
+    assert problem.compute_grad_objective(x) == pytest.approx(grad)
+    assert problem.compute_grad_objective(np.array(x)) == pytest.approx(grad)
+    assert problem.compute_grad_constraints(x) == pytest.approx(np.array([[2 * x[0], 2 * x[1]]]))
+
+
+def test_jit_finite_differences():
+    pytest.importorskip("numba")
+    x = np.array([0.3, -0.7])
+    problem = OptimisationProblem(objective)
+    for _ in range(2):
+        jitted = OptimisationProblem(objective, jit=True)
+        assert jitted.compute_grad_objective(x) == pytest.approx(problem.compute_grad_objective(x))
+    # The finite difference kernel is not recompiled for new instances:
+    assert len(_compile_fd_grad().signatures) == 1
+
+
+def test_complex_step():
+    x = np.array([0.3, -0.7])
+    exact = np.array([-2 * (1 - x[0]) - 400 * x[0] * (x[1] - x[0] ** 2), 200 * (x[1] - x[0] ** 2)])
+    problem = OptimisationProblem(objective)
+    batched = OptimisationProblem(
+        objective,
+        objective_batched=lambda X: (1 - X[:, 0]) ** 2 + 100 * (X[:, 1] - X[:, 0] ** 2) ** 2,
+    )
+    for p in (problem, batched):
+        assert p.compute_grad_objective(x, dx=1e-30, method="COMPLEX_STEP") == pytest.approx(
+            exact, rel=1e-14
+        )
+    with pytest.raises(ValueError):
+        problem.compute_grad_objective(x, method="FORWARD")
+
+
+def test_close_executor():
+    x = np.array([0.3, -0.7])
+    with OptimisationProblem(objective, workers=2) as problem:
+        problem.compute_grad_objective(x)
+        executor = problem._executor
+        assert executor is not None
+    assert problem._executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(objective, x)
+    problem.close()
+
+
+def test_cached_evaluations_of_lists_and_reused_buffers():
+    buffer = np.empty(2)
+
+    def grad_objective(x):
+        buffer[:] = [-2 * (1 - x[0]) - 400 * x[0] * (x[1] - x[0] ** 2), 200 * (x[1] - x[0] ** 2)]
+        return buffer
+
+    problem = OptimisationProblem(objective, grad_objective=grad_objective)
+    assert problem.compute_objective([0.3, -0.7]) == pytest.approx(objective([0.3, -0.7]))
+    grad = problem.compute_grad_objective(np.array([0.3, -0.7]))
+    problem.compute_grad_objective(np.array([1.0, 1.0]))
+    assert problem.compute_grad_objective(np.array([0.3, -0.7])) == pytest.approx(grad)
+
+
+def test_numba_imported_lazily():
+    code = "import sys, aso.problem_factory; assert 'numba' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_integer_design_variables():
+    x = np.array([1, 2])
+    for workers in (None, 2):
+        with OptimisationProblem(objective, i_constraints=[g1], workers=workers) as problem:
+            grad = problem.compute_grad_objective(x)
+            grad_g = problem.compute_grad_constraints(x)
+        assert grad == pytest.approx([-400.0, 200.0], rel=1e-6)
+        assert grad_g == pytest.approx(np.array([[2.0, 4.0]]), rel=1e-6)
@@ -59,3 +59,30 @@ def test_mma(problem, x, rel, abs):
     iterations = optimiser.optimise("MMA", iteration_limit=1000)
     assert iterations >= 0
     assert any(x == pytest.approx(expected=min, rel=rel, abs=abs) for min in problem.minima)
+
+
+def test_history():
+    problem = PF.sphere()
+    x = np.array([1.0, 2.0])
+    optimiser = Optimiser(problem, x)
+    assert optimiser.history_x.shape == (0, 2)
+
+    for iteration in range(20):
+        step = -0.1 * x
+        optimiser.record_iteration(iteration, problem.compute_objective(x), step)
+        x += step
+
+    assert optimiser.history_length == 20
+    result = optimiser.get_result(1)
+    assert result.iteration == 1
+    assert result.x == pytest.approx([0.9, 1.8])
+    assert result.objective == pytest.approx(0.81 + 3.24)
+    assert result.step == pytest.approx([-0.09, -0.18])
+
+    result.x[:] = 0
+    assert optimiser.get_result(1).x == pytest.approx([0.9, 1.8])
+    with pytest.raises(IndexError):
+        optimiser.get_result(20)
+
+    optimiser._trim_history()
+    assert optimiser.history_x.shape == (20, 2)
@@ -0,0 +1,94 @@
+import json
+import os
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parents[1] / "scripts"))
+
+import zip_project  # noqa: E402
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    contents = {
+        "src/a.py": b"print('a')\n" * 1000,
+        "src/b.py": bytes(range(256)) * 100,
+        "c.txt": b"",
+    }
+    for name, data in contents.items():
+        Path(name).parent.mkdir(parents=True, exist_ok=True)
+        Path(name).write_bytes(data)
+    config = Path("config.yaml")
+    config.write_text("files:\n" + "".join(f"  - path: {name}\n" for name in contents))
+    return config, contents
+
+
+@pytest.mark.parametrize("parallel_size", [0, zip_project._PARALLEL_SIZE])
+def test_zip_project(project, monkeypatch, parallel_size):
+    config, contents = project
+    monkeypatch.setattr(zip_project, "_PARALLEL_SIZE", parallel_size)
+    monkeypatch.setattr(zip_project.os, "cpu_count", lambda: 2)
+    zip_project.main(["--config", str(config), "--project", "1", "--student", "1"])
+    with zipfile.ZipFile("aso_project_1_student_1.zip") as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == list(contents)
+        for name, data in contents.items():
+            assert zip_file.read(name) == data
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setattr(zip_project, "_CACHE", zip_project.OrderedDict())
+    config = tmp_path / "config.yaml"
+    config.write_text("files:\n  - a.py\n")
+    return config
+
+
+def test_deserialize_cache_hit(config):
+    # An unrelated JSON file with the same name is neither read nor overwritten:
+    (config.parent / "config.json").write_text("[]")
+    assert zip_project._deserialize(config) == {"files": ["a.py"]}
+    cache_path = config.parent / ".config.yaml.cache.json"
+    cache = json.loads(cache_path.read_text())
+    cache["data"] = {"files": ["cached.py"]}
+    cache_path.write_text(json.dumps(cache))
+    assert zip_project._deserialize(config) == {"files": ["cached.py"]}
+    assert (config.parent / "config.json").read_text() == "[]"
+
+
+def test_deserialize_stale_cache(config):
+    zip_project._deserialize(config)
+    stat = config.stat()
+    # Same modification time but a different size:
+    config.write_text("files:\n  - bc.py\n")
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert zip_project._deserialize(config) == {"files": ["bc.py"]}
+    # Same size but a different modification time:
+    config.write_text("files:\n  - de.py\n")
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns - 1))
+    assert zip_project._deserialize(config) == {"files": ["de.py"]}
+
+
+@pytest.mark.parametrize("text", ["{", "[]", "{}", '{"mtime_ns": 0}'])
+def test_deserialize_corrupt_cache(config, text):
+    (config.parent / ".config.yaml.cache.json").write_text(text)
+    assert zip_project.deserialize(config) == {"files": ["a.py"]}
+    assert zip_project._deserialize(config) == {"files": ["a.py"]}
+
+
+def test_zip_project_case_insensitive_paths(project, monkeypatch):
+    config, contents = project
+    # Simulate a case-insensitive filesystem, on which the directory
+    # entries may differ in case from the configured paths, so that the
+    # lookup of the entries misses:
+    empty = Path("empty")
+    empty.mkdir()
+    scandir = os.scandir
+    monkeypatch.setattr(zip_project.os, "scandir", lambda path: scandir(empty))
+    zip_project.main(["--config", str(config), "--project", "1", "--student", "1"])
+    with zipfile.ZipFile("aso_project_1_student_1.zip") as zip_file:
+        assert zip_file.namelist() == list(contents)